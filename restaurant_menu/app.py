@@ -2,25 +2,25 @@ from __future__ import annotations
 import os
 from datetime import timedelta
 
+import click
 from flask import (
-    Flask, render_template, request, redirect,
+    Flask, current_app, render_template, request, redirect,
     url_for, flash, session, send_from_directory
 )
+from flask.cli import get_debug_flag, with_appcontext
 from flask_sqlalchemy import SQLAlchemy
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy.exc import OperationalError
+from werkzeug.serving import is_running_from_reloader
 from werkzeug.utils import secure_filename
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 UPLOAD_FOLDER = os.path.join(BASE_DIR, "static", "uploads")
+JINJA_CACHE_FOLDER = os.path.join(BASE_DIR, ".jinja_cache")
+GUEST_TEMPLATES = ("menu.html",)
 ALLOWED_EXT = {"png", "jpg", "jpeg", "webp", "gif"}
 
-app = Flask(__name__)
-app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "change-me-please")
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(BASE_DIR, "menu.db")
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
-app.permanent_session_lifetime = timedelta(days=7)
-
-db = SQLAlchemy(app)
+db = SQLAlchemy()
 
 
 class Menu(db.Model):
@@ -99,14 +99,14 @@ def save_image(file_storage):
         return None
 
     filename = secure_filename(file_storage.filename)
-    os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
-    save_path = os.path.join(app.config["UPLOAD_FOLDER"], filename)
+    os.makedirs(current_app.config["UPLOAD_FOLDER"], exist_ok=True)
+    save_path = os.path.join(current_app.config["UPLOAD_FOLDER"], filename)
 
     base, ext = os.path.splitext(filename)
     c = 1
     while os.path.exists(save_path):
         filename = f"{base}_{c}{ext}"
-        save_path = os.path.join(app.config["UPLOAD_FOLDER"], filename)
+        save_path = os.path.join(current_app.config["UPLOAD_FOLDER"], filename)
         c += 1
 
     file_storage.save(save_path)
@@ -156,13 +156,10 @@ def get_settings() -> Settings:
     return settings
 
 
-@app.route("/")
-def index():
+def get_catalog():
     menus = Menu.query.order_by(Menu.id.asc()).all()
     categories = Category.query.order_by(Category.id.asc()).all()
     dishes = Dish.query.order_by(Dish.id.asc()).all()
-    settings = get_settings()
-
     menus_out = [
         dict(
             id=m.id,
@@ -204,6 +201,13 @@ def index():
         for d in dishes
     ]
 
+    return menus_out, cats_out, dishes_out
+
+
+def index():
+    menus_out, cats_out, dishes_out = get_catalog()
+    settings = get_settings()
+
     return render_template(
         "menu.html",
         menus=menus_out,
@@ -214,7 +218,6 @@ def index():
     )
 
 
-@app.route("/admin/login", methods=["GET", "POST"])
 def admin_login():
     if request.method == "POST":
         password = request.form.get("password", "")
@@ -228,14 +231,12 @@ def admin_login():
     return render_template("admin_login.html")
 
 
-@app.route("/admin/logout")
 def admin_logout():
     session.clear()
     flash("Вы вышли.", "info")
     return redirect(url_for("admin_login"))
 
 
-@app.route("/admin", methods=["GET", "POST"])
 def admin_dashboard():
     if not session.get("is_admin"):
         return redirect(url_for("admin_login"))
@@ -264,7 +265,6 @@ def admin_dashboard():
     return render_template("admin_dashboard.html", stats=stats, settings=settings)
 
 
-@app.route("/admin/menus", methods=["GET", "POST"])
 def admin_menus():
     if not session.get("is_admin"):
         return redirect(url_for("admin_login"))
@@ -308,7 +308,6 @@ def admin_menus():
     return render_template("admin_menus.html", menus=menus)
 
 
-@app.route("/admin/menus/<int:menu_id>/edit", methods=["GET", "POST"])
 def admin_menu_edit(menu_id):
     if not session.get("is_admin"):
         return redirect(url_for("admin_login"))
@@ -351,7 +350,6 @@ def admin_menu_edit(menu_id):
     return render_template("admin_menu_edit.html", menu=menu)
 
 
-@app.route("/admin/categories", methods=["GET", "POST"])
 def admin_categories():
     if not session.get("is_admin"):
         return redirect(url_for("admin_login"))
@@ -396,7 +394,6 @@ def admin_categories():
     return render_template("admin_categories.html", cats=cats, menus=menus)
 
 
-@app.route("/admin/categories/<int:cat_id>/edit", methods=["GET", "POST"])
 def admin_category_edit(cat_id):
     if not session.get("is_admin"):
         return redirect(url_for("admin_login"))
@@ -435,7 +432,6 @@ def admin_category_edit(cat_id):
     return render_template("admin_category_edit.html", cat=cat, menus=menus)
 
 
-@app.route("/admin/dishes", methods=["GET", "POST"])
 def admin_dishes():
     if not session.get("is_admin"):
         return redirect(url_for("admin_login"))
@@ -501,7 +497,6 @@ def admin_dishes():
     return render_template("admin_dishes.html", dishes=dishes, cats=cats)
 
 
-@app.route("/admin/dishes/<int:dish_id>/edit", methods=["GET", "POST"])
 def admin_dish_edit(dish_id):
     if not session.get("is_admin"):
         return redirect(url_for("admin_login"))
@@ -564,12 +559,12 @@ def admin_dish_edit(dish_id):
     return render_template("admin_dish_edit.html", dish=dish, cats=cats)
 
 
-@app.route("/uploads/<path:filename>")
 def uploads(filename):
-    return send_from_directory(app.config["UPLOAD_FOLDER"], filename)
+    return send_from_directory(current_app.config["UPLOAD_FOLDER"], filename)
 
 
-@app.cli.command("init-db")
+@click.command("init-db")
+@with_appcontext
 def init_db_cmd():
     db.create_all()
 
@@ -647,7 +642,101 @@ def init_db_cmd():
         db.session.commit()
 
 
-if __name__ == "__main__":
+@click.command("compile-templates")
+@with_appcontext
+def compile_templates_cmd():
+    """Precompile every template into the bytecode cache (run once per deploy)."""
+    names = current_app.jinja_env.list_templates(extensions=["html"])
+    for name in names:
+        current_app.jinja_env.get_template(name)
+    click.echo(f"Compiled {len(names)} templates")
+
+
+def warm_up(app):
+    """Do the guest page's first-request work up front so a fresh worker answers fast."""
     with app.app_context():
-        db.create_all()
-    app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
+        for name in GUEST_TEMPLATES:
+            app.jinja_env.get_template(name)
+
+        # Read-only: compiles the guest-page queries, never inserts rows.
+        try:
+            Settings.query.first()
+            get_catalog()
+        except OperationalError:
+            # Schema is not there yet (e.g. before `flask init-db`).
+            db.session.rollback()
+        finally:
+            db.session.remove()
+            # Don't hand a pooled sqlite connection to forked workers.
+            db.engine.dispose()
+
+
+def _warm_by_default():
+    """WARM_UP=0 opts out; otherwise warm only a process that will serve requests."""
+    if os.environ.get("WARM_UP", "1") != "1":
+        return False
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return True
+    if ctx.info_name != "run":
+        return False  # init-db, routes, shell, ...
+    reload = ctx.params.get("reload")
+    if reload is None:
+        reload = get_debug_flag()
+    # With the reloader only the child process serves.
+    return not reload or is_running_from_reloader()
+
+
+def create_app(warm=None, create_schema=None):
+    """Build the app. Run with `flask --app app run` or `gunicorn -c gunicorn.conf.py`."""
+    if warm is None:
+        warm = _warm_by_default()
+    if create_schema is None:
+        create_schema = os.environ.get("CREATE_SCHEMA") == "1"
+
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "change-me-please")
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(BASE_DIR, "menu.db")
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+    app.permanent_session_lifetime = timedelta(days=7)
+
+    cache_dir = os.environ.get("JINJA_CACHE_FOLDER", JINJA_CACHE_FOLDER)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        pass  # read-only deploy: templates still compile, just not cached on disk
+    else:
+        app.jinja_options = dict(app.jinja_options, bytecode_cache=FileSystemBytecodeCache(cache_dir))
+
+    db.init_app(app)
+
+    app.add_url_rule("/", view_func=index)
+    app.add_url_rule("/admin/login", view_func=admin_login, methods=["GET", "POST"])
+    app.add_url_rule("/admin/logout", view_func=admin_logout)
+    app.add_url_rule("/admin", view_func=admin_dashboard, methods=["GET", "POST"])
+    app.add_url_rule("/admin/menus", view_func=admin_menus, methods=["GET", "POST"])
+    app.add_url_rule("/admin/menus/<int:menu_id>/edit", view_func=admin_menu_edit, methods=["GET", "POST"])
+    app.add_url_rule("/admin/categories", view_func=admin_categories, methods=["GET", "POST"])
+    app.add_url_rule("/admin/categories/<int:cat_id>/edit", view_func=admin_category_edit, methods=["GET", "POST"])
+    app.add_url_rule("/admin/dishes", view_func=admin_dishes, methods=["GET", "POST"])
+    app.add_url_rule("/admin/dishes/<int:dish_id>/edit", view_func=admin_dish_edit, methods=["GET", "POST"])
+    app.add_url_rule("/uploads/<path:filename>", view_func=uploads)
+
+    app.cli.add_command(init_db_cmd)
+    app.cli.add_command(compile_templates_cmd)
+
+    if create_schema:
+        with app.app_context():
+            db.create_all()
+
+    if warm:
+        warm_up(app)
+
+    return app
+
+
+if __name__ == "__main__":
+    # With debug=True the reloader runs this block twice; warm only the serving child.
+    app = create_app(warm=os.environ.get("WARM_UP", "1") == "1" and is_running_from_reloader())
+    app.run(host="0.0.0.0", port=5000, debug=True)
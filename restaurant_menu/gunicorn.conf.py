@@ -0,0 +1,10 @@
+# gunicorn -c gunicorn.conf.py
+import os
+
+wsgi_app = "app:create_app()"
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+
+# Build and warm the app once in the master; forked workers inherit the
+# compiled guest templates and queries instead of repeating that work.
+preload_app = True